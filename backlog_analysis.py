@@ -0,0 +1,118 @@
+
+from typing import List
+import matplotlib.pyplot as plt
+import pandas as pd
+from data_loader import DataLoader
+from model import Issue, State
+import config
+
+# Column that holds the backlog over all issues
+ALL_ISSUES:str = 'all'
+
+
+def open_close_transitions(issue:Issue) -> List[tuple]:
+    """
+    Returns the (date, delta) pairs of an issue: +1 when it is created or
+    reopened and -1 when it is closed. Close and reopen events that don't
+    change the state are ignored. A closed issue without a closing event
+    is considered closed at its updated_date.
+    """
+    if issue.created_date is None:
+        return []
+    transitions = [(issue.created_date, 1)]
+    is_open = True
+    events = sorted((e for e in issue.events if e.event_date is not None), key=lambda e: e.event_date)
+    for event in events:
+        if event.event_type == 'closed' and is_open:
+            transitions.append((event.event_date, -1))
+            is_open = False
+        elif event.event_type == 'reopened' and not is_open:
+            transitions.append((event.event_date, 1))
+            is_open = True
+    if is_open and issue.state == State.closed and issue.updated_date is not None:
+        transitions.append((max(issue.updated_date, transitions[-1][0]), -1))
+    return transitions
+
+
+def backlog_series(issues:List[Issue]) -> pd.DataFrame:
+    """
+    Computes the number of open issues at the end of every day, overall
+    (column ALL_ISSUES) and for each label (one column per label).
+    The open/close transitions are summed per day and label, sorted once
+    by the groupby and accumulated with a cumulative sum.
+    """
+    records = []
+    for issue in issues:
+        for date, delta in open_close_transitions(issue):
+            records.append((date, delta, ALL_ISSUES))
+            for label in issue.labels:
+                records.append((date, delta, label))
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame.from_records(records, columns=['date', 'delta', 'label'])
+    # Removing TimeZone after converting everything to UTC
+    df['date'] = pd.to_datetime(df['date'], utc=True).dt.tz_localize(None).dt.normalize()
+
+    daily = df.groupby(['date', 'label'])['delta'].sum().unstack(fill_value=0)
+    days = pd.date_range(daily.index.min(), daily.index.max(), freq='D')
+    return daily.reindex(days, fill_value=0).cumsum()
+
+
+class BacklogAnalysis:
+    """
+    Plots the number of open issues over time, overall and for the
+    most frequent labels (or the label passed in via --label).
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.LABEL:str = config.get_parameter('label')
+        self.TOP_N:int = config.get_parameter('top', 5)
+
+    def run(self):
+        """
+        Starting point for this analysis.
+        """
+        issues:List[Issue] = DataLoader().get_issues()
+        backlog = backlog_series(issues)
+        if backlog.empty:
+            print('No issues to analyze.')
+            return
+
+        if self.LABEL is not None:
+            if self.LABEL not in backlog.columns:
+                print(f'No issues with label {self.LABEL}.')
+                return
+            labels = [self.LABEL]
+        else:
+            # Labels with the most issues in the backlog on average
+            labels = backlog.drop(columns=ALL_ISSUES).mean().nlargest(self.TOP_N).index.tolist()
+
+        print(f'\nOpen issues on {backlog.index[-1].date()}: {backlog[ALL_ISSUES].iloc[-1]}')
+        print(f'Largest backlog: {backlog[ALL_ISSUES].max()} open issues on {backlog[ALL_ISSUES].idxmax().date()}')
+        for label in labels:
+            print(f'  {label}: {backlog[label].iloc[-1]} open (max {backlog[label].max()})')
+
+        ### PLOT ###
+        fig, (ax_all, ax_labels) = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
+        fig.suptitle('Open Issues Over Time')
+        ax_all.plot(backlog.index, backlog[ALL_ISSUES], color='blue')
+        ax_all.set_title('All issues')
+        ax_all.set_ylabel('Open issues')
+        ax_all.grid(True, linestyle='--', alpha=0.7)
+        for label in labels:
+            ax_labels.plot(backlog.index, backlog[label], label=label)
+        ax_labels.set_title('By label')
+        ax_labels.set_ylabel('Open issues')
+        ax_labels.legend(loc='upper left')
+        ax_labels.grid(True, linestyle='--', alpha=0.7)
+        plt.xlabel('Date')
+        plt.tight_layout()
+        plt.show()
+
+
+if __name__ == '__main__':
+    # Invoke run method when running this module directly
+    BacklogAnalysis().run()
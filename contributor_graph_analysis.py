@@ -0,0 +1,141 @@
+
+from typing import Dict, List, Tuple
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from data_loader import DataLoader
+from model import Issue
+import config
+
+
+def interaction_graph(issues:List[Issue], self_loops:bool=False) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    Builds the weighted adjacency matrix of the contributor interaction graph
+    and returns it together with the user of each row/column. The edge from
+    a commenter to an issue creator is weighted by the number of comments.
+    Comments on one's own issues are left out unless self_loops is set.
+    """
+    user_ids:Dict[str,int] = {}
+    rows, cols = [], []
+    for issue in issues:
+        if issue.creator is None:
+            continue
+        for event in issue.events:
+            if event.event_type != 'commented' or event.author is None:
+                continue
+            if event.author == issue.creator and not self_loops:
+                continue
+            rows.append(user_ids.setdefault(event.author, len(user_ids)))
+            cols.append(user_ids.setdefault(issue.creator, len(user_ids)))
+    n_users = len(user_ids)
+    data = np.ones(len(rows), dtype=np.float64)
+    # Duplicate entries are summed, which gives the number of comments per edge
+    adjacency = sparse.csr_matrix((data, (rows, cols)), shape=(n_users, n_users))
+    return adjacency, list(user_ids)
+
+
+def pagerank(adjacency:sparse.csr_matrix, damping:float=0.85, tol:float=1e-10, max_iter:int=100) -> np.ndarray:
+    """
+    Computes the weighted PageRank of every node with power iteration.
+    Rank flows along the edges, so users who receive comments from
+    well-connected users rank high. Nodes without outgoing edges spread
+    their rank evenly over all nodes.
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_strength = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_strength == 0
+    inv_out = np.divide(1.0, out_strength, out=np.zeros(n), where=~dangling)
+    # Column-stochastic transition matrix so that rank = transition @ rank
+    transition = (sparse.diags(inv_out) @ adjacency).T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        new_rank = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        converged = np.abs(new_rank - rank).sum() < tol
+        rank = new_rank
+        if converged:
+            break
+    return rank / rank.sum()
+
+
+def contributor_metrics(adjacency:sparse.csr_matrix, users:List[str]) -> pd.DataFrame:
+    """
+    Returns PageRank, in/out strength and the weakly and strongly
+    connected component of every user, highest PageRank first.
+    """
+    _, weak = connected_components(adjacency, directed=True, connection='weak')
+    _, strong = connected_components(adjacency, directed=True, connection='strong')
+    return pd.DataFrame({
+        'user': users,
+        'pagerank': pagerank(adjacency),
+        # Comments received on own issues / comments made on others' issues
+        'in_strength': np.asarray(adjacency.sum(axis=0)).ravel().astype(np.int64),
+        'out_strength': np.asarray(adjacency.sum(axis=1)).ravel().astype(np.int64),
+        'weak_component': weak,
+        'strong_component': strong,
+    }).sort_values(by='pagerank', ascending=False, ignore_index=True)
+
+
+def write_edge_list(adjacency:sparse.csr_matrix, users:List[str], path:str):
+    """
+    Writes the graph as a weighted edge list ("source target weight" per line),
+    which can be read with e.g. networkx.read_weighted_edgelist.
+    """
+    edges = adjacency.tocoo()
+    with open(path,'w') as fout:
+        for source, target, weight in zip(edges.row, edges.col, edges.data):
+            fout.write(f'{users[source]} {users[target]} {weight:g}\n')
+
+
+class ContributorGraphAnalysis:
+    """
+    Analyzes who comments on whose issues as a graph with an edge
+    from every commenter to the creator of the issue.
+    The graph can be exported as an edge list (--output).
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.OUTPUT:str = config.get_parameter('output')
+        self.TOP_N:int = config.get_parameter('top', 25)
+
+    def run(self):
+        """
+        Starting point for this analysis.
+        """
+        issues:List[Issue] = DataLoader().get_issues()
+        adjacency, users = interaction_graph(issues)
+        if not users:
+            print('No comments to analyze.')
+            return
+        metrics = contributor_metrics(adjacency, users)
+
+        n_weak = metrics['weak_component'].nunique()
+        largest = metrics['weak_component'].value_counts().iloc[0]
+        print(f'\n{len(users)} users, {adjacency.nnz} interactions ({int(adjacency.sum())} comments).')
+        print(f'{n_weak} connected groups of users; the largest has {largest} users.')
+        print(f'\nTop {self.TOP_N} users by PageRank:')
+        print(metrics.head(self.TOP_N)[['user', 'pagerank', 'in_strength', 'out_strength']].to_string(index=False))
+
+        if self.OUTPUT:
+            write_edge_list(adjacency, users, self.OUTPUT)
+            print(f'\nWrote edge list to {self.OUTPUT}.')
+
+        ### PLOT ###
+        top = metrics.head(self.TOP_N).iloc[::-1]
+        plt.figure(figsize=(10, 8))
+        plt.barh(top['user'], top['pagerank'], color='skyblue')
+        plt.title(f'Top {self.TOP_N} Contributors by PageRank in the Interaction Graph')
+        plt.xlabel('PageRank')
+        plt.tight_layout()
+        plt.show()
+
+
+if __name__ == '__main__':
+    # Invoke run method when running this module directly
+    ContributorGraphAnalysis().run()
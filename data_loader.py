@@ -1,6 +1,10 @@
 
+import argparse
+import gzip
+import io
 import json
-from typing import List
+import os
+from typing import Dict, Iterator, List, Tuple
 
 import config
 from model import Issue
@@ -8,17 +12,29 @@ from model import Issue
 # Store issues as singleton to avoid reloads
 _ISSUES:List[Issue] = None
 
+# Sidecar index (issue number -> byte offset) of a JSON Lines data file
+_INDEX:Dict[int,int] = None
+
+# Byte offsets of all records in the JSON Lines data file, from the sidecar index
+_OFFSETS:List[int] = None
+
+# Extension of the sidecar index written next to a JSON Lines data file
+INDEX_SUFFIX:str = '.idx'
+
 class DataLoader:
     """
     Loads the issue data into a runtime object.
+
+    The data file can be a JSON array (.json) or JSON Lines (.jsonl),
+    optionally compressed with gzip (.gz) or zstandard (.zst).
     """
-    
+
     def __init__(self):
         """
         Constructor
         """
         self.data_path:str = config.get_parameter('ENPM611_PROJECT_DATA_PATH')
-        
+
     def get_issues(self):
         """
         This should be invoked by other parts of the application to get access
@@ -29,15 +45,164 @@ class DataLoader:
             _ISSUES = self._load()
             print(f'Loaded {len(_ISSUES)} issues from {self.data_path}.')
         return _ISSUES
-    
+
+    def get_issue(self, number:int):
+        """
+        Returns the issue with the given number, or None if there is no such issue.
+        If the data file is an uncompressed JSON Lines file with a sidecar index
+        (see convert_to_jsonl), only that one issue is read from disk.
+        """
+        number = int(number)
+        if _ISSUES is None:
+            index = self._get_index()
+            offset = index.get(number) if index is not None else None
+            if offset is not None:
+                with open(self.data_path,'rb') as fin:
+                    fin.seek(offset)
+                    line = fin.readline()
+                try:
+                    issue = Issue(json.loads(line))
+                except ValueError:
+                    issue = None
+                if issue is not None and issue.number == number:
+                    return issue
+                # The data file was rewritten without updating the index
+                print(f'Index {self.data_path + INDEX_SUFFIX} is out of date, loading all issues.')
+            elif index is not None:
+                return None
+        for issue in self.get_issues():
+            if issue.number == number:
+                return issue
+        return None
+
+    def get_chunks(self, num_chunks:int) -> List[Tuple[int,int]]:
+        """
+        Splits an indexed JSON Lines data file into at most num_chunks
+        (start, end) byte ranges that begin and end on record boundaries.
+        Each range can be read independently with load_chunk, e.g. from
+        separate processes.
+        """
+        if self._get_index() is None:
+            raise ValueError(f'{self.data_path} has no index. Create it with convert_to_jsonl.')
+        offsets = _OFFSETS
+        if not offsets:
+            return []
+        size = os.path.getsize(self.data_path)
+        num_chunks = max(1, min(num_chunks, len(offsets)))
+        step = -(-len(offsets) // num_chunks) # ceiling division
+        starts = offsets[::step]
+        return list(zip(starts, starts[1:] + [size]))
+
+    def load_chunk(self, start:int, end:int) -> List[Issue]:
+        """
+        Loads the issues stored between the byte offsets start and end
+        of a JSON Lines data file.
+        """
+        with open(self.data_path,'rb') as fin:
+            fin.seek(start)
+            data = fin.read(end - start)
+        return [Issue(json.loads(line)) for line in data.splitlines() if line.strip()]
+
     def _load(self):
         """
         Loads the issues into memory.
         """
-        with open(self.data_path,'r') as fin:
-            return [Issue(i) for i in json.load(fin)]
-    
+        return [Issue(i) for i in iter_records(self.data_path)]
+
+    def _get_index(self):
+        """
+        Loads the sidecar index of the data file if the data file
+        is an uncompressed JSON Lines file and the index exists.
+        Returns the issue number -> offset map; the offsets of all
+        records are kept in _OFFSETS.
+        """
+        global _INDEX, _OFFSETS
+        if _INDEX is None:
+            index_path = self.data_path + INDEX_SUFFIX
+            if not self.data_path.endswith('.jsonl') or not os.path.isfile(index_path):
+                return None
+            with open(index_path,'r') as fin:
+                index = json.load(fin)
+            if 'offsets' not in index or 'numbers' not in index:
+                print(f'Index {index_path} has an old format. Recreate it with convert_to_jsonl.')
+                return None
+            _INDEX = {int(number): offset for number, offset in index['numbers'].items()}
+            _OFFSETS = index['offsets']
+        return _INDEX
+
+
+def _open_text(path:str):
+    """
+    Opens the file for reading as text, decompressing it on the fly
+    based on its extension.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path,'rt',encoding='utf-8')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f'Reading {path} requires the zstandard package (pip install zstandard).')
+        fin = open(path,'rb')
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(fin, closefd=True), encoding='utf-8')
+    return open(path,'r',encoding='utf-8')
+
+
+def iter_records(path:str) -> Iterator[dict]:
+    """
+    Yields the raw issue records (dictionaries) of a data file.
+    JSON Lines files are read one line at a time.
+    """
+    base = path[:-len(os.path.splitext(path)[1])] if path.endswith(('.gz','.zst')) else path
+    with _open_text(path) as fin:
+        if base.endswith('.jsonl'):
+            for line in fin:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(fin)
+
+
+def _to_number(value):
+    """
+    Converts an issue number the way the model does, or returns None
+    if it is not a valid number.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def convert_to_jsonl(src_path:str, dst_path:str):
+    """
+    Converts a data file of any supported format into an uncompressed
+    JSON Lines file plus a sidecar index (dst_path + '.idx') with the byte
+    offset of every line and a map from issue number to the offset of its line.
+    Records without a valid number are only in the offsets, and if a number
+    repeats, the map points to its first record.
+    """
+    offsets:List[int] = []
+    numbers:Dict[str,int] = {}
+    with open(dst_path,'wb') as fout:
+        for record in iter_records(src_path):
+            offset = fout.tell()
+            offsets.append(offset)
+            number = _to_number(record.get('number'))
+            if number is not None and str(number) not in numbers:
+                numbers[str(number)] = offset
+            fout.write(json.dumps(record).encode('utf-8') + b'\n')
+    with open(dst_path + INDEX_SUFFIX,'w') as fout:
+        json.dump({'offsets': offsets, 'numbers': numbers}, fout)
+    print(f'Wrote {len(offsets)} issues to {dst_path}.')
+
 
 if __name__ == '__main__':
-    # Run the loader for testing
-    DataLoader().get_issues()
\ No newline at end of file
+    # Run the loader for testing, or convert the data file with --convert
+    parser = argparse.ArgumentParser(description='Load or convert the GitHub issues data file.')
+    parser.add_argument('--convert', type=str, help='Path of the JSON Lines file to write')
+    args = parser.parse_args()
+    if args.convert:
+        convert_to_jsonl(DataLoader().data_path, args.convert)
+    else:
+        DataLoader().get_issues()
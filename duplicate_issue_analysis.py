@@ -0,0 +1,331 @@
+
+import hashlib
+import os
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+import numpy as np
+from data_loader import DataLoader
+from model import Issue
+import config
+
+# Mersenne prime used by the MinHash permutations; shingle hashes are reduced
+# modulo this value so a * x + b stays within 64 bits
+_PRIME = np.uint64((1 << 31) - 1)
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Number of words per shingle
+SHINGLE_SIZE:int = 3
+
+# Bump when shingling or hashing changes so cached signatures are recomputed
+SIGNATURE_VERSION:int = 1
+
+
+def shingles(issue:Issue, k:int=SHINGLE_SIZE) -> np.ndarray:
+    """
+    Returns the hashed word k-shingles of the issue title and body.
+    """
+    words = _WORD_RE.findall(f'{issue.title or ""} {issue.text or ""}'.lower())
+    # Short texts become a single shingle
+    k = max(1, min(k, len(words)))
+    hashes = {zlib.crc32(' '.join(words[i:i + k]).encode('utf-8')) for i in range(len(words) - k + 1)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % _PRIME
+
+
+def content_hash(issue:Issue) -> str:
+    """
+    Returns a hash of the issue title and body, which identifies
+    the cached signature of the issue.
+    """
+    return hashlib.sha1(f'{issue.title or ""}\0{issue.text or ""}'.encode('utf-8')).hexdigest()
+
+
+def _minhash_batch(args) -> np.ndarray:
+    """
+    Computes the MinHash signatures of a batch of shingle sets.
+    Documents without shingles get a signature of all _PRIME.
+    The shingles are hashed in slices of at most max_shingles columns, so
+    memory stays bounded even for a single issue with a very long body.
+    """
+    shingle_sets, a, b, max_shingles = args
+    signatures = np.full((len(shingle_sets), len(a)), _PRIME, dtype=np.uint64)
+    if not any(s.size for s in shingle_sets):
+        return signatures
+    values = np.concatenate(shingle_sets)
+    # Document of every shingle
+    owners = np.repeat(np.arange(len(shingle_sets)), [s.size for s in shingle_sets])
+    for start in range(0, values.size, max_shingles):
+        part, part_owners = values[start:start + max_shingles], owners[start:start + max_shingles]
+        docs_start = np.flatnonzero(np.diff(part_owners, prepend=-1))
+        docs = part_owners[docs_start]
+        # One row per permutation, one column per shingle
+        hashed = (a[:, None] * part[None, :] + b[:, None]) % _PRIME
+        signatures[docs] = np.minimum(signatures[docs], np.minimum.reduceat(hashed, docs_start, axis=1).T)
+    return signatures
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with num_perm random hash functions.
+    """
+
+    def __init__(self, num_perm:int=128, seed:int=1, max_shingles:int=1 << 15, workers:int=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm:int = num_perm
+        self.seed:int = seed
+        # Shingles per batch; each batch needs num_perm * max_shingles * 8 bytes
+        self.max_shingles:int = max_shingles
+        self.workers:int = workers
+        self.a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+    def _batches(self, shingle_sets:List[np.ndarray]) -> List[tuple]:
+        """
+        Groups consecutive shingle sets into batches of at most max_shingles
+        shingles. Larger issues get a batch of their own.
+        """
+        batches, batch, size = [], [], 0
+        for shingle_set in shingle_sets:
+            if batch and size + shingle_set.size > self.max_shingles:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(shingle_set)
+            size += shingle_set.size
+        if batch:
+            batches.append(batch)
+        return [(batch, self.a, self.b, self.max_shingles) for batch in batches]
+
+    def signatures(self, issues:List[Issue]) -> np.ndarray:
+        """
+        Returns a (len(issues), num_perm) matrix of signatures. Batches are
+        spread over worker processes if workers > 1.
+        """
+        batches = self._batches([shingles(issue) for issue in issues])
+        if not batches:
+            return np.zeros((0, self.num_perm), dtype=np.uint64)
+        if self.workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(self.workers) as executor:
+                return np.vstack(list(executor.map(_minhash_batch, batches)))
+        return np.vstack([_minhash_batch(batch) for batch in batches])
+
+
+def candidate_probability(bands:int, rows:int, similarity):
+    """
+    Probability that two documents with the given Jaccard similarity
+    share at least one band and so become a candidate pair.
+    """
+    return 1 - (1 - np.power(similarity, rows)) ** bands
+
+
+def lsh_bands(num_perm:int, threshold:float, false_negative_weight:float=0.9) -> Tuple[int,int]:
+    """
+    Picks the number of bands and rows per band (using at most num_perm
+    permutations) that minimizes the weighted probability of false positives
+    (pairs below the threshold becoming candidates) and false negatives
+    (pairs above it being missed). Candidates are checked against the
+    threshold anyway, so missed pairs are weighted higher by default.
+    """
+    below = np.linspace(0, threshold, 201)
+    above = np.linspace(threshold, 1, 201)
+    best, best_error = None, None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            # Areas under/over the S-curve, approximated on an even grid
+            false_positive = candidate_probability(bands, rows, below).mean() * threshold
+            false_negative = (1 - candidate_probability(bands, rows, above)).mean() * (1 - threshold)
+            error = (1 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+            if best_error is None or error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """
+    Locality-sensitive hashing index over MinHash signatures. Signatures are
+    split into bands and documents sharing any band become candidate pairs,
+    which are kept if their estimated Jaccard similarity reaches the threshold.
+    """
+
+    def __init__(self, num_perm:int, threshold:float):
+        self.threshold:float = threshold
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        self.buckets:List[Dict[bytes,List[int]]] = [{} for _ in range(self.bands)]
+        self.keys:List[int] = []
+        self._signatures:List[np.ndarray] = []
+
+    def recall(self, similarity:float) -> float:
+        """
+        Probability that a pair with the given similarity is found.
+        """
+        return float(candidate_probability(self.bands, self.rows, similarity))
+
+    def _band_keys(self, signature:np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, signature:np.ndarray) -> List[Tuple[int,float]]:
+        """
+        Returns the (key, similarity) pairs of the indexed
+        signatures that are similar to the given signature.
+        """
+        candidates = set()
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(band.get(band_key, ()))
+        results = []
+        for i in candidates:
+            similarity = float(np.mean(self._signatures[i] == signature))
+            if similarity >= self.threshold:
+                results.append((self.keys[i], similarity))
+        return sorted(results, key=lambda r: -r[1])
+
+    def add(self, key:int, signature:np.ndarray):
+        """
+        Adds a signature to the index under the given key
+        (e.g. the position of the issue in the issue list).
+        """
+        doc = len(self.keys)
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            band.setdefault(band_key, []).append(doc)
+        self.keys.append(key)
+        self._signatures.append(signature)
+
+    def candidate_pairs(self) -> List[Tuple[int,int,float]]:
+        """
+        Returns all (key, key, similarity) pairs of indexed signatures
+        whose similarity reaches the threshold.
+        """
+        pairs = set()
+        for band in self.buckets:
+            for docs in band.values():
+                for i in range(len(docs)):
+                    for j in range(i + 1, len(docs)):
+                        pairs.add((docs[i], docs[j]))
+        results = []
+        for i, j in pairs:
+            similarity = float(np.mean(self._signatures[i] == self._signatures[j]))
+            if similarity >= self.threshold:
+                results.append((self.keys[i], self.keys[j], similarity))
+        return results
+
+
+def clusters(pairs:List[Tuple[int,int,float]]) -> List[List[int]]:
+    """
+    Groups the keys connected by similar pairs (union-find),
+    largest clusters first.
+    """
+    parent:Dict[int,int] = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for x, y, _ in pairs:
+        parent[find(x)] = find(y)
+    groups:Dict[int,List[int]] = {}
+    for x in parent:
+        groups.setdefault(find(x), []).append(x)
+    return sorted((sorted(g) for g in groups.values()), key=lambda g: (-len(g), g[0]))
+
+
+def signatures_of(signatures, num_perm:int) -> np.ndarray:
+    """
+    Stacks signatures into a matrix, which has no rows if there are none.
+    """
+    signatures = list(signatures)
+    if not signatures:
+        return np.zeros((0, num_perm), dtype=np.uint64)
+    return np.vstack(signatures)
+
+
+class DuplicateIssueAnalysis:
+    """
+    Finds clusters of near-duplicate issues with MinHash and LSH.
+    The similarity threshold can be passed in via command line (--threshold).
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.THRESHOLD:float = float(config.get_parameter('threshold', 0.8))
+        self.WORKERS:int = int(config.get_parameter('workers', 1))
+        data_path:str = config.get_parameter('ENPM611_PROJECT_DATA_PATH')
+        self.CACHE_PATH:str = config.get_parameter('ENPM611_PROJECT_MINHASH_PATH', data_path + '.minhash.npz')
+        self.hasher = MinHasher(workers=self.WORKERS)
+
+    def get_signatures(self, issues:List[Issue]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the signatures of the issues and which of them were not cached
+        yet. Signatures are cached on disk by the hash of the issue title and
+        body, so edited issues are hashed again. Entries of issues that no
+        longer exist in that form are dropped from the cache.
+        """
+        params = np.array([SIGNATURE_VERSION, SHINGLE_SIZE, self.hasher.seed, self.hasher.num_perm])
+        cached:Dict[str,np.ndarray] = {}
+        if os.path.isfile(self.CACHE_PATH):
+            with np.load(self.CACHE_PATH) as cache:
+                if 'params' in cache and np.array_equal(cache['params'], params):
+                    cached = dict(zip(cache['keys'].tolist(), cache['signatures']))
+        keys = [content_hash(issue) for issue in issues]
+        is_new = np.array([key not in cached for key in keys], dtype=bool)
+        new_issues = [issue for issue, new in zip(issues, is_new) if new]
+        if new_issues:
+            cached.update(zip([k for k, new in zip(keys, is_new) if new], self.hasher.signatures(new_issues)))
+        signatures = signatures_of([cached[key] for key in keys], self.hasher.num_perm)
+        if new_issues or len(cached) != len(set(keys)):
+            unique = dict(zip(keys, signatures))
+            # Through a file handle, as np.savez adds .npz to other paths
+            with open(self.CACHE_PATH,'wb') as fout:
+                np.savez(fout, keys=np.array(list(unique.keys()), dtype='<U40'),
+                         signatures=signatures_of(unique.values(), self.hasher.num_perm), params=params)
+            print(f'Computed {len(new_issues)} new signatures ({len(unique)} cached in {self.CACHE_PATH}).')
+        return signatures, is_new
+
+    def run(self):
+        """
+        Starting point for this analysis.
+        """
+        issues:List[Issue] = DataLoader().get_issues()
+        signatures, is_new = self.get_signatures(issues)
+        # Issues without title and text can't be compared
+        comparable = signatures[:, 0] != _PRIME
+
+        # Pairs among the issues that were already hashed in earlier runs...
+        lsh = MinHashLSH(self.hasher.num_perm, self.THRESHOLD)
+        for i in np.flatnonzero(comparable & ~is_new):
+            lsh.add(int(i), signatures[i])
+        pairs = lsh.candidate_pairs()
+        # ...and new issues matched against all issues added before them
+        new_matches:Dict[int,List[Tuple[int,float]]] = {}
+        for i in np.flatnonzero(comparable & is_new):
+            matches = lsh.query(signatures[i])
+            if matches:
+                new_matches[int(i)] = matches
+                pairs.extend((j, int(i), similarity) for j, similarity in matches)
+            lsh.add(int(i), signatures[i])
+        groups = clusters(pairs)
+
+        print(f'\nUsing {lsh.bands} bands of {lsh.rows} rows; pairs with similarity {self.THRESHOLD} '
+              f'are found with probability {lsh.recall(self.THRESHOLD):.0%}, '
+              f'pairs with similarity {min(self.THRESHOLD + 0.05, 1):.2f} with {lsh.recall(min(self.THRESHOLD + 0.05, 1)):.0%}.')
+        # On the first run every issue is new, so only the clusters are shown
+        if new_matches and not is_new.all():
+            print(f'\n{len(new_matches)} new or edited issues look like duplicates:')
+            for i, matches in new_matches.items():
+                similar = ', '.join(f'#{issues[j].number} ({similarity:.2f})' for j, similarity in matches)
+                print(f'  #{issues[i].number}\t{issues[i].title}\n\t-> {similar}')
+        print(f'\nFound {len(groups)} clusters of near-duplicate issues '
+              f'({sum(len(g) for g in groups)} issues, similarity >= {self.THRESHOLD}).')
+        for group in groups[:20]:
+            print(f'\n{len(group)} issues:')
+            for i in group:
+                print(f'  #{issues[i].number}\t{issues[i].title}')
+
+
+if __name__ == '__main__':
+    # Invoke run method when running this module directly
+    DuplicateIssueAnalysis().run()
@@ -0,0 +1,258 @@
+
+import hashlib
+import os
+import pickle
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+import numpy as np
+from data_loader import DataLoader
+from model import Issue
+import config
+
+# Bump when the layout of the persisted index changes
+INDEX_VERSION:int = 2
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text:str) -> List[str]:
+    """
+    Splits text into lowercase alphanumeric tokens.
+    """
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _issue_tokens(issue:Issue) -> List[str]:
+    """
+    Returns the tokens of the issue title, body and comments.
+    """
+    tokens = tokenize(issue.title) + tokenize(issue.text)
+    for event in issue.events:
+        tokens += tokenize(event.comment)
+    return tokens
+
+
+def _encode_varints(values:Iterable[int]) -> bytes:
+    """
+    Encodes non-negative integers as variable-length bytes
+    (7 bits per byte, high bit set on all but the last byte).
+    """
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def _decode_varints(data:bytes) -> np.ndarray:
+    """
+    Decodes a byte string created by _encode_varints without a Python loop.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if raw.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    is_last = (raw & 0x80) == 0
+    ends = np.flatnonzero(is_last)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Position of each byte within its varint determines its shift
+    group = np.concatenate(([0], np.cumsum(is_last[:-1])))
+    shifts = (np.arange(raw.size) - starts[group]) * 7
+    parts = (raw & 0x7f).astype(np.int64) << shifts
+    return np.add.reduceat(parts, starts)
+
+
+class SearchIndex:
+    """
+    Inverted index over issue titles, bodies and comments with BM25 ranking.
+    Each term maps to a postings list of (document gap, term frequency) pairs
+    that is stored varint-compressed. Documents get increasing ids as they are
+    added, so new issues are appended to the postings without rewriting them.
+    When an indexed issue changes, its old document is tombstoned (marked as
+    deleted and skipped by search) and the new version is appended.
+    """
+
+    def __init__(self, k1:float=1.2, b:float=0.75):
+        self.k1:float = k1
+        self.b:float = b
+        self.doc_numbers:List[int] = []
+        self.doc_lengths:List[int] = []
+        self.doc_hashes:List[str] = []
+        self.postings:Dict[str,bytearray] = {}
+        self.last_doc:Dict[str,int] = {}
+        # Issue number -> id of its current (not tombstoned) document
+        self.live_docs:Dict[int,int] = {}
+        self.deleted:Set[int] = set()
+
+    def __len__(self):
+        return len(self.live_docs)
+
+    def add_issues(self, issues:Iterable[Issue]) -> int:
+        """
+        Adds the issues that are not indexed yet and re-indexes the issues
+        whose title, body or comments changed. Returns how many were (re)indexed.
+        Issues without a number can't be reported by search and are skipped,
+        and if a number repeats, only its first issue is indexed.
+        """
+        added = 0
+        seen = set()
+        for issue in issues:
+            if issue.number < 0 or issue.number in seen:
+                continue
+            seen.add(issue.number)
+            tokens = _issue_tokens(issue)
+            content_hash = hashlib.sha1(' '.join(tokens).encode('utf-8')).hexdigest()
+            doc_id = self.live_docs.get(issue.number)
+            if doc_id is not None:
+                if self.doc_hashes[doc_id] == content_hash:
+                    continue
+                self.deleted.add(doc_id)
+            self._add(issue.number, tokens, content_hash)
+            added += 1
+        return added
+
+    def sync(self, issues:List[Issue]) -> Tuple[int,int]:
+        """
+        Brings the index in line with the given issues: adds and re-indexes
+        them like add_issues and tombstones the indexed issues that are no
+        longer among them. Returns how many issues were (re)indexed and removed.
+        """
+        added = self.add_issues(issues)
+        numbers = {issue.number for issue in issues}
+        removed = [number for number in self.live_docs if number not in numbers]
+        for number in removed:
+            self.deleted.add(self.live_docs.pop(number))
+        return added, len(removed)
+
+    def _add(self, number:int, tokens:List[str], content_hash:str):
+        doc_id = len(self.doc_numbers)
+        term_freqs:Dict[str,int] = {}
+        for token in tokens:
+            term_freqs[token] = term_freqs.get(token, 0) + 1
+        for term, tf in term_freqs.items():
+            gap = doc_id - self.last_doc.get(term, 0)
+            self.postings.setdefault(term, bytearray()).extend(_encode_varints((gap, tf)))
+            self.last_doc[term] = doc_id
+        self.doc_numbers.append(number)
+        self.doc_lengths.append(len(tokens))
+        self.doc_hashes.append(content_hash)
+        self.live_docs[number] = doc_id
+
+    def _postings(self, term:str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the document ids and term frequencies of a term.
+        """
+        values = _decode_varints(bytes(self.postings[term]))
+        return np.cumsum(values[0::2]), values[1::2]
+
+    def search(self, query:str, top_n:int=10) -> List[Tuple[int,float]]:
+        """
+        Returns up to top_n (issue number, score) pairs ranked by BM25.
+        A document matches if it contains any of the query terms.
+        """
+        terms = [t for t in set(tokenize(query)) if t in self.postings]
+        if not terms or not self.live_docs:
+            return []
+        live = np.ones(len(self.doc_numbers), dtype=bool)
+        live[list(self.deleted)] = False
+        n_docs = len(self.live_docs)
+        doc_lengths = np.asarray(self.doc_lengths, dtype=np.float64)
+        norm = self.k1 * (1 - self.b + self.b * doc_lengths / max(doc_lengths[live].mean(), 1))
+        scores = np.zeros(len(self.doc_numbers))
+        for term in terms:
+            doc_ids, tfs = self._postings(term)
+            keep = live[doc_ids]
+            doc_ids, tfs = doc_ids[keep], tfs[keep]
+            # Document frequency over the live documents only
+            df = doc_ids.size
+            if df == 0:
+                continue
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + norm[doc_ids])
+        matched = np.flatnonzero(scores)
+        if matched.size > top_n:
+            # Keep everything tied with the top_n-th score so ties are broken below
+            cutoff = -np.partition(-scores[matched], top_n - 1)[top_n - 1]
+            matched = matched[scores[matched] >= cutoff]
+        # Highest score first, ties by issue number
+        numbers = np.asarray(self.doc_numbers)[matched]
+        matched = matched[np.lexsort((numbers, -scores[matched]))][:top_n]
+        return [(self.doc_numbers[i], float(scores[i])) for i in matched]
+
+    def save(self, path:str):
+        """
+        Writes the index to disk.
+        """
+        with open(path,'wb') as fout:
+            pickle.dump((INDEX_VERSION, self.__dict__), fout, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path:str):
+        """
+        Reads an index written by save, or returns None if the file does not
+        exist or was written by an incompatible version.
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path,'rb') as fin:
+            version, state = pickle.load(fin)
+        if version != INDEX_VERSION:
+            return None
+        index = cls()
+        index.__dict__.update(state)
+        return index
+
+
+class IssueSearch:
+    """
+    Searches the issues for the terms given via command line (--query)
+    and prints the ranked issue numbers.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.QUERY:str = config.get_parameter('query')
+        self.TOP_N:int = config.get_parameter('top', 10)
+        data_path:str = config.get_parameter('ENPM611_PROJECT_DATA_PATH')
+        self.INDEX_PATH:str = config.get_parameter('ENPM611_PROJECT_SEARCH_INDEX_PATH', data_path + '.search')
+        self.data_path:str = data_path
+
+    def get_index(self) -> SearchIndex:
+        """
+        Loads the persisted index. The index is (re)built from the data file
+        if it does not exist yet. If the data file has changed since the index
+        was written, new issues are added, issues with new comments or
+        edited titles or bodies are re-indexed and removed issues are dropped.
+        """
+        index = SearchIndex.load(self.INDEX_PATH)
+        if index is not None and os.path.getmtime(self.INDEX_PATH) >= os.path.getmtime(self.data_path):
+            return index
+        if index is None:
+            index = SearchIndex()
+        added, removed = index.sync(DataLoader().get_issues())
+        index.save(self.INDEX_PATH)
+        print(f'Indexed {added} new or changed issues and removed {removed} ({len(index)} total) into {self.INDEX_PATH}.')
+        return index
+
+    def run(self):
+        """
+        Starting point for this analysis.
+        """
+        if not self.QUERY:
+            print('Please specify search terms with --query.')
+            return
+        index = self.get_index()
+        results = index.search(str(self.QUERY), self.TOP_N)
+        print(f'\n{len(results)} results for "{self.QUERY}":')
+        for number, score in results:
+            print(f'  #{number}\t{score:.3f}')
+
+
+if __name__ == '__main__':
+    # Invoke run method when running this module directly
+    IssueSearch().run()
@@ -0,0 +1,120 @@
+
+from typing import Dict, List, Tuple
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from data_loader import DataLoader
+from model import Issue
+import config
+
+
+def label_incidence(issues:List[Issue]) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    Builds the sparse issue x label incidence matrix (1 if the issue has
+    the label) and returns it together with the label of each column.
+    """
+    label_ids:Dict[str,int] = {}
+    rows, cols = [], []
+    for row, issue in enumerate(issues):
+        for label in set(issue.labels):
+            rows.append(row)
+            cols.append(label_ids.setdefault(label, len(label_ids)))
+    data = np.ones(len(rows), dtype=np.int64)
+    incidence = sparse.csr_matrix((data, (rows, cols)), shape=(len(issues), len(label_ids)))
+    return incidence, list(label_ids)
+
+
+def cooccurrence_pairs(incidence:sparse.csr_matrix, labels:List[str]) -> pd.DataFrame:
+    """
+    Computes the label x label co-occurrence matrix with a single sparse
+    product and returns one row per pair of labels that appear together,
+    with their co-occurrence count, lift and Jaccard similarity.
+    """
+    n_issues = incidence.shape[0]
+    cooccurrence = (incidence.T @ incidence).tocoo()
+    label_counts = np.asarray(incidence.sum(axis=0)).ravel()
+    # Every pair only once
+    upper = cooccurrence.row < cooccurrence.col
+    a, b, count = cooccurrence.row[upper], cooccurrence.col[upper], cooccurrence.data[upper]
+    count_a, count_b = label_counts[a], label_counts[b]
+    return pd.DataFrame({
+        'label_a': np.asarray(labels, dtype=object)[a],
+        'label_b': np.asarray(labels, dtype=object)[b],
+        'count': count,
+        # How much more often the labels appear together than if they were independent
+        'lift': count * n_issues / (count_a * count_b),
+        'jaccard': count / (count_a + count_b - count),
+    }).sort_values(by='count', ascending=False, ignore_index=True)
+
+
+def label_cooccurrence(issues:List[Issue], by_year:bool=False):
+    """
+    Returns the label pairs of all issues, or a dictionary of the label
+    pairs of the issues created in each year if by_year is set.
+    """
+    incidence, labels = label_incidence(issues)
+    if not by_year:
+        return cooccurrence_pairs(incidence, labels)
+    years = np.array([issue.created_date.year if issue.created_date else -1 for issue in issues])
+    return {int(year): cooccurrence_pairs(incidence[years == year], labels)
+            for year in np.unique(years) if year != -1}
+
+
+class LabelCooccurrenceAnalysis:
+    """
+    Analyzes which labels are used together on issues.
+    Can be restricted to the issues created in one year (--year).
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.YEAR:int = config.get_parameter('year')
+        self.TOP_N:int = config.get_parameter('top', 15)
+
+    def run(self):
+        """
+        Starting point for this analysis.
+        """
+        issues:List[Issue] = DataLoader().get_issues()
+        if self.YEAR is not None:
+            issues = [issue for issue in issues if issue.created_date and issue.created_date.year == self.YEAR]
+        incidence, labels = label_incidence(issues)
+        pairs = cooccurrence_pairs(incidence, labels)
+        if pairs.empty:
+            print('No labels are used together.')
+            return
+
+        period = f' in {self.YEAR}' if self.YEAR is not None else ''
+        print(f'\nMost frequent label pairs{period}:')
+        print(pairs.head(self.TOP_N).to_string(index=False))
+        # Ignore rare pairs whose lift is mostly noise
+        print(f'\nLabel pairs with the highest lift{period} (at least 5 issues):')
+        print(pairs[pairs['count'] >= 5].nlargest(self.TOP_N, 'lift').to_string(index=False))
+
+        ### PLOT ###
+        # Jaccard similarity between the most frequent labels
+        label_counts = np.asarray(incidence.sum(axis=0)).ravel()
+        top = np.argsort(-label_counts)[:self.TOP_N]
+        sub = incidence[:, top]
+        together = (sub.T @ sub).toarray()
+        counts = label_counts[top]
+        jaccard = together / (counts[:, None] + counts[None, :] - together)
+        np.fill_diagonal(jaccard, np.nan)
+        top_labels = [labels[i] for i in top]
+
+        plt.figure(figsize=(12, 10))
+        plt.imshow(jaccard, cmap='Blues')
+        plt.colorbar(label='Jaccard similarity')
+        plt.xticks(range(len(top_labels)), top_labels, rotation=45, ha='right')
+        plt.yticks(range(len(top_labels)), top_labels)
+        plt.title(f'Label Co-occurrence of the Top {len(top_labels)} Labels{period}')
+        plt.tight_layout()
+        plt.show()
+
+
+if __name__ == '__main__':
+    # Invoke run method when running this module directly
+    LabelCooccurrenceAnalysis().run()
@@ -8,20 +8,36 @@ from label_analysis import LabelAnalysis
 from top_commenters_vs_creators_analysis import TopCommentersVsCreatorsAnalysis
 from Issue_creation_analysis import MonthlyIssueAnalysis
 from issue_response_time_analysis import IssueResponseTimeAnalysis
+from issue_search import IssueSearch
+from duplicate_issue_analysis import DuplicateIssueAnalysis
+from backlog_analysis import BacklogAnalysis
+from label_cooccurrence_analysis import LabelCooccurrenceAnalysis
+from contributor_graph_analysis import ContributorGraphAnalysis
+from time_to_close_analysis import TimeToCloseAnalysis
+import config
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze GitHub issues data.')
-    parser.add_argument('--feature', type=int, choices=[1, 2, 3, 4, 5, 6], required=True, help='Choose feature to run')
+    parser.add_argument('--feature', type=int, choices=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12], required=True, help='Choose feature to run')
+    parser.add_argument('--query', type=str, help='Search terms (feature 7)')
+    parser.add_argument('--top', type=int, help='Number of search results (feature 7), labels (features 9, 10, 12) or users (feature 11) to show')
+    parser.add_argument('--threshold', type=float, help='Minimum similarity of duplicate issues (feature 8)')
+    parser.add_argument('--workers', type=int, help='Number of worker processes (feature 8)')
+    parser.add_argument('--label', type=str, help='Label to analyze (feature 9)')
+    parser.add_argument('--year', type=int, help='Only analyze issues created in this year (feature 10)')
+    parser.add_argument('--output', type=str, help='File to write the interaction graph edge list to (feature 11)')
     args = parser.parse_args()
-
-    issues = load_issues()
+    # Make the command line arguments accessible through the config
+    config.overwrite_from_args(args)
 
     if args.feature == 1:
+        issues = load_issues()
         label_counts = analyze_issue_labels(issues)
         print("Label Counts:", label_counts)
         plot_label_distribution(label_counts)
 
     elif args.feature == 2:
+        issues = load_issues()
         time_differences = time_to_update(issues)
         # Plot the results
         plot_time_to_update(time_differences)
@@ -33,6 +49,18 @@ def main():
         MonthlyIssueAnalysis().run()
     elif args.feature ==6:
         IssueResponseTimeAnalysis().run()
+    elif args.feature ==7:
+        IssueSearch().run()
+    elif args.feature ==8:
+        DuplicateIssueAnalysis().run()
+    elif args.feature ==9:
+        BacklogAnalysis().run()
+    elif args.feature ==10:
+        LabelCooccurrenceAnalysis().run()
+    elif args.feature ==11:
+        ContributorGraphAnalysis().run()
+    elif args.feature ==12:
+        TimeToCloseAnalysis().run()
 
 
     
@@ -0,0 +1,191 @@
+
+from typing import Dict, List
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from data_loader import DataLoader
+from model import Issue
+from backlog_analysis import open_close_transitions
+import config
+
+# z value of the 95% confidence intervals
+_Z:float = 1.959963984540054
+
+
+def close_durations(issues:List[Issue]) -> pd.DataFrame:
+    """
+    Returns the time from creation to the first close of every issue in days.
+    Issues that were never closed are censored at the latest creation, update
+    or event date of any issue (closed=False), since all we know is that they
+    took longer than that. A close dated before the creation counts as zero days.
+    """
+    records = []
+    # Every date in the data, to find the end of the observation period
+    all_dates = []
+    for issue in issues:
+        all_dates += [issue.created_date, issue.updated_date] + [e.event_date for e in issue.events]
+        transitions = open_close_transitions(issue)
+        if not transitions:
+            continue
+        closes = [date for date, delta in transitions if delta < 0]
+        records.append({
+            'number': issue.number,
+            'created_date': issue.created_date,
+            'end_date': closes[0] if closes else None,
+            'labels': issue.labels,
+        })
+    df = pd.DataFrame.from_records(records, columns=['number', 'created_date', 'end_date', 'labels'])
+    df['created_date'] = pd.to_datetime(df['created_date'], utc=True)
+    df['end_date'] = pd.to_datetime(df['end_date'], utc=True)
+    df['closed'] = df['end_date'].notna()
+    # Censor the open issues at the latest event, update or creation in the data
+    last_date = pd.to_datetime(pd.Series(all_dates, dtype=object), utc=True).max()
+    df['end_date'] = df['end_date'].fillna(last_date)
+    # A close dated before the creation (clock skew, imports) counts as immediate
+    df['days'] = ((df['end_date'] - df['created_date']).dt.total_seconds() / 86400).clip(lower=0)
+    df['year'] = df['created_date'].dt.year
+    return df
+
+
+def kaplan_meier(days:np.ndarray, closed:np.ndarray) -> pd.DataFrame:
+    """
+    Computes the Kaplan-Meier estimate of the share of issues still open after
+    each distinct duration, with 95% confidence bounds (Greenwood variance on
+    the log(-log) scale). Everything is computed on the sorted durations
+    without a Python loop.
+    """
+    order = np.argsort(days, kind='stable')
+    days = np.asarray(days, dtype=np.float64)[order]
+    closed = np.asarray(closed, dtype=np.int64)[order]
+    times, first = np.unique(days, return_index=True)
+    events = np.add.reduceat(closed, first) if days.size else np.zeros(0, dtype=np.int64)
+    at_risk = days.size - first
+    keep = events > 0
+    times, events, at_risk = times[keep], events[keep], at_risk[keep]
+
+    survival = np.cumprod(1 - events / at_risk)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        greenwood = np.cumsum(events / (at_risk * (at_risk - events)))
+        log_survival = np.log(survival)
+        se = np.sqrt(greenwood) / np.abs(log_survival)
+        lower = survival ** np.exp(_Z * se)
+        upper = survival ** np.exp(-_Z * se)
+    # The bounds are undefined once every remaining issue is closed
+    done = survival == 0
+    lower[done], upper[done] = 0.0, 0.0
+    return pd.DataFrame({'days': times, 'at_risk': at_risk, 'closed': events,
+                         'survival': survival, 'lower': lower, 'upper': upper})
+
+
+# Tolerance when comparing the curve with 0.5; the cumulative product can
+# end up a few ulps above 0.5 where the exact value is 0.5
+_HALF_TOLERANCE:float = 1e-12
+
+
+def _first_below_half(days:np.ndarray, values:np.ndarray) -> float:
+    below = np.flatnonzero(values <= 0.5 + _HALF_TOLERANCE)
+    return float(days[below[0]]) if below.size else np.nan
+
+
+def median_time_to_close(curve:pd.DataFrame) -> Dict[str,float]:
+    """
+    Returns the median time to close (first duration where at most half of
+    the issues are still open) and its 95% confidence interval, read off
+    the confidence bounds of the curve. Values are NaN if they are not reached.
+    """
+    days = curve['days'].to_numpy()
+    return {'median': _first_below_half(days, curve['survival'].to_numpy()),
+            'median_lower': _first_below_half(days, curve['lower'].to_numpy()),
+            'median_upper': _first_below_half(days, curve['upper'].to_numpy())}
+
+
+def survival_by_group(durations:pd.DataFrame, column:str, values:List=None) -> Dict[object,pd.DataFrame]:
+    """
+    Computes a Kaplan-Meier curve for every value of the column
+    ('labels' or 'year'), or only for the given values.
+    """
+    df = durations.explode('labels') if column == 'labels' else durations
+    df = df.dropna(subset=[column])
+    if values is not None:
+        df = df[df[column].isin(values)]
+    return {value: kaplan_meier(group['days'].to_numpy(), group['closed'].to_numpy())
+            for value, group in df.groupby(column)}
+
+
+def summary(durations:pd.DataFrame, curves:Dict[object,pd.DataFrame], column:str) -> pd.DataFrame:
+    """
+    Returns the number of issues, closed issues and the median
+    time to close with its confidence interval per group.
+    """
+    df = durations.explode('labels') if column == 'labels' else durations
+    sizes = df.groupby(column).agg(issues=('closed', 'size'), closed=('closed', 'sum'))
+    rows = [{column: value, **median_time_to_close(curve)} for value, curve in curves.items()]
+    return pd.DataFrame(rows, columns=[column, 'median', 'median_lower', 'median_upper']) \
+        .join(sizes, on=column)[[column, 'issues', 'closed', 'median', 'median_lower', 'median_upper']]
+
+
+class TimeToCloseAnalysis:
+    """
+    Estimates how long issues take to be closed with Kaplan-Meier curves,
+    treating issues that are still open as censored, overall and per label
+    and creation year.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.TOP_N:int = config.get_parameter('top', 5)
+
+    def run(self):
+        """
+        Starting point for this analysis.
+        """
+        issues:List[Issue] = DataLoader().get_issues()
+        durations = close_durations(issues)
+        if durations.empty:
+            print('No issues to analyze.')
+            return
+
+        overall = kaplan_meier(durations['days'].to_numpy(), durations['closed'].to_numpy())
+        median = median_time_to_close(overall)
+        print(f'\n{len(durations)} issues, {durations["closed"].sum()} closed.')
+        if np.isnan(median['median']):
+            print('More than half of the issues are still open, so the median time to close is not reached.')
+        else:
+            print(f'Median time to close: {median["median"]:.1f} days '
+                  f'(95% CI {median["median_lower"]:.1f} - {median["median_upper"]:.1f}, NaN = not reached)')
+
+        label_counts = durations.explode('labels')['labels'].value_counts()
+        top_labels = label_counts.index[:self.TOP_N].tolist()
+        by_label = survival_by_group(durations, 'labels', top_labels)
+        by_year = survival_by_group(durations, 'year')
+        print('\nMedian days to close by label (NaN = not reached):')
+        print(summary(durations, by_label, 'labels').to_string(index=False, float_format='{:.1f}'.format))
+        print('\nMedian days to close by creation year (NaN = not reached):')
+        print(summary(durations, by_year, 'year').to_string(index=False, float_format='{:.1f}'.format))
+
+        ### PLOT ###
+        fig, (ax_label, ax_year) = plt.subplots(1, 2, figsize=(16, 6), sharey=True)
+        fig.suptitle('Share of Issues Still Open Over Time (Kaplan-Meier)')
+        ax_label.step(overall['days'], overall['survival'], where='post', color='black', label='All issues')
+        ax_label.fill_between(overall['days'], overall['lower'], overall['upper'], step='post', color='black', alpha=0.15)
+        for label, curve in by_label.items():
+            ax_label.step(curve['days'], curve['survival'], where='post', label=label)
+        ax_label.set_title(f'Top {len(by_label)} labels')
+        ax_label.set_ylabel('Share of issues still open')
+        for year, curve in by_year.items():
+            ax_year.step(curve['days'], curve['survival'], where='post', label=str(year))
+        ax_year.set_title('Creation year')
+        for axis in (ax_label, ax_year):
+            axis.set_xlabel('Days since creation')
+            axis.set_xscale('symlog')
+            axis.legend(loc='upper right')
+            axis.grid(True, linestyle='--', alpha=0.7)
+        plt.tight_layout()
+        plt.show()
+
+
+if __name__ == '__main__':
+    # Invoke run method when running this module directly
+    TimeToCloseAnalysis().run()